@@ -1,15 +1,62 @@
+import io
 import os
+import re
 import sys
 import enum
 import glob
 import stat
+import mmap
 import shutil
 import fnmatch
-import filecmp
-from itertools import filterfalse
+import hashlib
+import operator
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 import time
 
+# liburing is optional, batched stat/unlink fall back to plain os calls without it,
+# the binding API has changed across releases so require everything we use up front
+try:
+    import liburing
+    for _name in ('Ring', 'Cqe', 'Statx', 'io_uring_queue_init', 'io_uring_queue_exit',
+                  'io_uring_get_sqe', 'io_uring_prep_statx', 'io_uring_prep_unlink',
+                  'io_uring_sqe_set_data64', 'io_uring_submit_and_wait',
+                  'io_uring_wait_cqe', 'io_uring_cq_ready', 'io_uring_cq_advance'):
+        if not hasattr(liburing, _name):
+            liburing = None
+            break
+except ImportError:
+    liburing = None
+
+
+# cache of content digests keyed by (path, size, mtime_ns), disabled by --nocache
+_hash_cache = {}
+_use_hash_cache = True
+
+# read files above this size through mmap instead of a plain read
+_MMAP_THRESHOLD = 64 * 1024
+
+# window size for direct content comparison
+_CMP_WINDOW = 16 * 1024 * 1024
+
+# cache of parsed line arguments keyed by the tuple of line tokens
+_arg_cache = {}
+_ARG_CACHE_LIMIT = 4096
+
+# cache of fused glob regexes keyed by the tuple of patterns
+_pattern_cache = {}
+
+# destination directories already known to exist
+_mkdir_cache = set()
+
+# pull all line-namespace fields in one C-level call instead of repeated attribute lookups
+_getLineFields = operator.attrgetter('input', 'output', 'method', 'force',
+                                     'ignorepatterns', 'onlyfiles', 'deletedst', 'keeppatterns')
+
+# strip surrounding whitespace and quotes in a single match
+_strip_regex = re.compile(r'^[\s"]*(.*?)[\s"]*$')
+
 
 class Response(enum.Enum):
     Ok = 0
@@ -19,14 +66,27 @@ class Response(enum.Enum):
     Skip = 4
 
 
-class Method:
-    Copy = "copy"
-    Move = "move"
-    Link = "link"
-    Symlink = "symlink"
+class Method(enum.IntEnum):
+    Copy = 0
+    Move = 1
+    Link = 2
+    Symlink = 3
+
+
+# CLI method strings are mapped to enum members once at line-parse time
+_METHOD_BY_NAME = {
+    "copy": Method.Copy,
+    "move": Method.Move,
+    "link": Method.Link,
+    "symlink": Method.Symlink,
+}
 
 
 class Statistics:
+    # slots make the hot counter updates direct slot stores instead of dict writes
+    __slots__ = ('correct_lines', 'skipped_lines', 'incorrect_lines', 'total_lines',
+                 'succeeded_transfers', 'skipped_transfers', 'failed_transfers')
+
     def __init__(self):
         self.correct_lines = 0
         self.skipped_lines = 0
@@ -45,111 +105,367 @@ class ThrowingArgumentParser(argparse.ArgumentParser):
         raise ArgumentParserError(message)
 
 
-# compare two files
-def compareFiles(file1, file2, shallow=True):
-    return filecmp.cmp(file1, file2, shallow=shallow)
-
+# entries per io_uring submission, also the ring size
+_RING_CHUNK = 512
 
-# compare two directories (reworked dircmp)
-def compareDirs(dir1, dir2, shallow=True):
-    dir1_list = os.listdir(dir1)
-    dir2_list = os.listdir(dir2)
-    dir1_list.sort()
-    dir2_list.sort()
 
-    a = dict(zip(map(os.path.normcase, dir1_list), dir1_list))
-    b = dict(zip(map(os.path.normcase, dir2_list), dir2_list))
-    common = list(map(a.__getitem__, filter(b.__contains__, a)))
-    dir1_only = list(map(a.__getitem__, filterfalse(b.__contains__, a)))
-    dir2_only = list(map(b.__getitem__, filterfalse(a.__contains__, b)))
-    # if we have objects in only one directory then they are different
-    if dir1_only or dir2_only:
-        return False
+# build os.stat_result from a filled Statx buffer, the dict argument carries the
+# float and nanosecond time fields the positional tuple would leave unset
+def statxToStatResult(buf):
+    return os.stat_result(
+        (buf.mode, buf.ino, os.makedev(buf.dev_major, buf.dev_minor), buf.nlink,
+         buf.uid, buf.gid, buf.size, int(buf.atime), int(buf.mtime), int(buf.ctime)),
+        {'st_atime': buf.atime, 'st_mtime': buf.mtime, 'st_ctime': buf.ctime,
+         'st_atime_ns': round(buf.atime * 1e9), 'st_mtime_ns': round(buf.mtime * 1e9),
+         'st_ctime_ns': round(buf.ctime * 1e9)})
 
-    common_dirs = []
-    common_files = []
-    common_funny = []
-    for x in common:
-        a_path = os.path.join(dir1, x)
-        b_path = os.path.join(dir2, x)
 
-        ok = 1
+# stat all paths in chunked io_uring submissions, one os.stat per path otherwise,
+# returns a stat result per path with None for paths that cannot be stat'ed
+def batchStatx(paths):
+    if liburing is not None and len(paths) > 1:
         try:
-            a_stat = os.stat(a_path)
+            results = [None] * len(paths)
+            ring = liburing.Ring()
+            liburing.io_uring_queue_init(_RING_CHUNK, ring)
+            try:
+                cqe = liburing.Cqe()
+                # submit in ring-sized chunks so io_uring_get_sqe never runs dry
+                for start in range(0, len(paths), _RING_CHUNK):
+                    chunk = paths[start:start + _RING_CHUNK]
+                    bufs = [liburing.Statx() for _ in chunk]
+                    for i, path in enumerate(chunk):
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_statx(sqe, bufs[i], path)
+                        liburing.io_uring_sqe_set_data64(sqe, start + i)
+                    liburing.io_uring_submit_and_wait(ring, len(chunk))
+                    reaped = 0
+                    while reaped < len(chunk):
+                        liburing.io_uring_wait_cqe(ring, cqe)
+                        ready = liburing.io_uring_cq_ready(ring)
+                        for i in range(ready):
+                            entry = cqe[i]
+                            index = entry.user_data
+                            try:
+                                if entry.res == 0:
+                                    results[index] = statxToStatResult(bufs[index - start])
+                            # reading res of a failed request raises, leave its entry as None
+                            except OSError:
+                                pass
+                        liburing.io_uring_cq_advance(ring, ready)
+                        reaped += ready
+                return results
+            finally:
+                liburing.io_uring_queue_exit(ring)
         except OSError:
-            ok = 0
+            pass
+    results = []
+    for path in paths:
         try:
-            b_stat = os.stat(b_path)
+            results.append(os.stat(path))
         except OSError:
-            ok = 0
-
-        if ok:
-            a_type = stat.S_IFMT(a_stat.st_mode)
-            b_type = stat.S_IFMT(b_stat.st_mode)
-            if a_type != b_type:
-                common_funny.append(x)
-            elif stat.S_ISDIR(a_type):
-                common_dirs.append(x)
-            elif stat.S_ISREG(a_type):
-                common_files.append(x)
-            else:
-                common_funny.append(x)
+            results.append(None)
+    return results
+
+
+# unlink all paths in chunked io_uring submissions, one os.remove per path otherwise,
+# paths whose unlink request fails are retried with os.remove so real errors still raise
+def batchUnlink(paths):
+    if liburing is not None and len(paths) > 1:
+        failed = []
+        try:
+            ring = liburing.Ring()
+            liburing.io_uring_queue_init(_RING_CHUNK, ring)
+            try:
+                cqe = liburing.Cqe()
+                # submit in ring-sized chunks so io_uring_get_sqe never runs dry
+                for start in range(0, len(paths), _RING_CHUNK):
+                    chunk = paths[start:start + _RING_CHUNK]
+                    for i, path in enumerate(chunk):
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_unlink(sqe, path)
+                        liburing.io_uring_sqe_set_data64(sqe, start + i)
+                    liburing.io_uring_submit_and_wait(ring, len(chunk))
+                    reaped = 0
+                    while reaped < len(chunk):
+                        liburing.io_uring_wait_cqe(ring, cqe)
+                        ready = liburing.io_uring_cq_ready(ring)
+                        for i in range(ready):
+                            entry = cqe[i]
+                            index = entry.user_data
+                            try:
+                                entry.res
+                            # reading res of a failed request raises, retry those below
+                            except OSError:
+                                failed.append(paths[index])
+                        liburing.io_uring_cq_advance(ring, ready)
+                        reaped += ready
+            finally:
+                liburing.io_uring_queue_exit(ring)
+        except OSError:
+            failed = paths
+        for path in failed:
+            os.remove(path)
+        return
+    for path in paths:
+        os.remove(path)
+
+
+# return content digest of a file, memoized by (path, size, mtime_ns)
+def fileDigest(path, path_stat):
+    key = (path, path_stat.st_size, path_stat.st_mtime_ns)
+    if _use_hash_cache:
+        digest = _hash_cache.get(key)
+        if digest is not None:
+            return digest
+    hasher = hashlib.blake2b()
+    with open(path, 'rb', buffering=0) as file:
+        if path_stat.st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
         else:
-            common_funny.append(x)
-    # if we have invalid objects then report directories are different
-    if common_funny:
-        return False
+            hasher.update(file.read())
+    digest = hasher.digest()
+    if _use_hash_cache:
+        _hash_cache[key] = digest
+    return digest
+
+
+# compare file contents directly through mmap windows, each slice compare is a C-level memcmp
+def fastCmp(file1, file2, size):
+    if size == 0:
+        return True
+    with open(file1, 'rb', buffering=0) as f1, open(file2, 'rb', buffering=0) as f2:
+        with mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as map1, \
+                mmap.mmap(f2.fileno(), 0, access=mmap.ACCESS_READ) as map2:
+            for offset in range(0, size, _CMP_WINDOW):
+                if map1[offset:offset + _CMP_WINDOW] != map2[offset:offset + _CMP_WINDOW]:
+                    return False
+    return True
+
 
-    same_files, diff_files, funny_files = filecmp.cmpfiles(dir1, dir2, common_files, shallow=shallow)
-    # if we have different files or invalid objects then report directories are different
-    if diff_files or funny_files:
+# compare two files, stats can be passed in to avoid re-stating
+def compareFiles(file1, file2, shallow=True, stat1=None, stat2=None):
+    try:
+        if stat1 is None:
+            stat1 = os.stat(file1)
+        if stat2 is None:
+            stat2 = os.stat(file2)
+    # a file that cannot be stat'ed cannot be equal to anything
+    except OSError:
+        return False
+    # files with different sizes cannot be equal
+    if stat1.st_size != stat2.st_size:
         return False
+    # in shallow mode equal stats mean equal files
+    if shallow and stat1.st_mtime == stat2.st_mtime:
+        return True
+    # without the digest cache a windowed compare is cheaper than hashing, it can stop at the first
+    # differing window instead of reading both files to the end
+    if not _use_hash_cache:
+        return fastCmp(file1, file2, stat1.st_size)
+    return fileDigest(file1, stat1) == fileDigest(file2, stat2)
+
+
+# compare already-classified file pairs reusing their batched stats, unlike filecmp.cmpfiles this
+# never re-stats and skips content comparison when sizes differ,
+# returns False at the first differing or unreadable pair
+def compareFilePairs(file_pairs, stats1, stats2, shallow=True):
+    for (a_path, b_path), a_stat, b_stat in zip(file_pairs, stats1, stats2):
+        if a_stat is None or b_stat is None:
+            return False
+        try:
+            # report if files have differencies
+            if not compareFiles(a_path, b_path, shallow=shallow, stat1=a_stat, stat2=b_stat):
+                return False
+        except OSError:
+            return False
+    return True
 
-    # compare subdirs
-    for x in common_dirs:
-        a_x = os.path.join(dir1, x)
-        b_x = os.path.join(dir2, x)
-        # report if subdirs have differencies
-        if not compareDirs(a_x, b_x, shallow=shallow):
+
+# compare two directories (reworked dircmp, iterative so deep trees pay no per-frame call cost)
+def compareDirs(dir1, dir2, shallow=True, parallel=True):
+    stack = [(dir1, dir2)]
+    while stack:
+        d1, d2 = stack.pop()
+        with os.scandir(d1) as it1:
+            a = {os.path.normcase(entry.name): entry for entry in it1}
+        with os.scandir(d2) as it2:
+            b = {os.path.normcase(entry.name): entry for entry in it2}
+        # if we have objects in only one directory then they are different
+        if a.keys() ^ b.keys():
             return False
 
+        common_dirs = []
+        common_files = []
+        for key, a_entry in a.items():
+            b_entry = b[key]
+            try:
+                # classify through symlinks like the old os.stat based walk did,
+                # d_type still answers for plain entries without an extra stat
+                if a_entry.is_dir():
+                    if not b_entry.is_dir():
+                        return False
+                    common_dirs.append((a_entry.path, b_entry.path))
+                elif a_entry.is_file():
+                    if not b_entry.is_file():
+                        return False
+                    common_files.append((a_entry.path, b_entry.path))
+                # invalid objects mean directories are different
+                else:
+                    return False
+            except OSError:
+                return False
+
+        # compare common files, their stats are fetched in one batch per side
+        if common_files:
+            a_stats = batchStatx([a_path for a_path, b_path in common_files])
+            b_stats = batchStatx([b_path for a_path, b_path in common_files])
+            if not compareFilePairs(common_files, a_stats, b_stats, shallow=shallow):
+                return False
+
+        # compare large subdir fanouts in parallel, the work is almost entirely IO wait;
+        # workers run sequentially so only the top-level call ever owns a pool
+        if parallel and len(common_dirs) > 4:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+                futures = [executor.submit(compareDirs, a_path, b_path, shallow, False)
+                           for a_path, b_path in common_dirs]
+                for future in as_completed(futures):
+                    # report on the first subdir with differencies and cancel the rest
+                    if not future.result():
+                        for other in futures:
+                            other.cancel()
+                        return False
+        # small fanouts go onto the worklist instead of recursing
+        else:
+            stack.extend(common_dirs)
+
     return True
 
 
-# return list with filenames in path directory that match patterns
+# copy file content in kernel space when possible and preserve metadata like shutil.copy2
+def fastCopy(src, dst):
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        try:
+            try:
+                # no user-space buffers, can reflink on CoW filesystems
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+            except OSError:
+                try:
+                    # still zero-copy, works across filesystems; rewind both fds,
+                    # ftruncate alone leaves the write offset where the failure stopped
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    offset = 0
+                    while True:
+                        sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+                        if not sent:
+                            break
+                        offset += sent
+                except OSError:
+                    # last resort, plain read/write loop with a large buffer
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    with open(src_fd, 'rb', closefd=False) as src_file, \
+                            open(dst_fd, 'wb', closefd=False) as dst_file:
+                        shutil.copyfileobj(src_file, dst_file, 1024 * 1024)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+# transfer functions for a single file keyed by method
+_FILE_DISPATCH = {
+    Method.Copy: fastCopy,
+    Method.Move: shutil.move,
+    Method.Link: os.link,
+    Method.Symlink: os.symlink,
+}
+
+
+# copy a directory tree with in-kernel file copies and one compiled ignore regex
+def fastCopytree(src, dst, ignore_regex=None):
+    for root, dirs, files in os.walk(src):
+        if ignore_regex is not None:
+            # prune ignored subdirs in place so walk never descends into them
+            dirs[:] = [d for d in dirs if not ignore_regex.match(d)]
+            files = [f for f in files if not ignore_regex.match(f)]
+        rel = os.path.relpath(root, src)
+        dst_root = dst if rel == '.' else os.path.join(dst, rel)
+        os.makedirs(dst_root, exist_ok=True)
+        for d in dirs:
+            src_dir = os.path.join(root, d)
+            # walk never descends into symlinked dirs, copy their trees explicitly
+            # like shutil.copytree with symlinks=False would
+            if os.path.islink(src_dir):
+                fastCopytree(src_dir, os.path.join(dst_root, d), ignore_regex)
+        for f in files:
+            fastCopy(os.path.join(root, f), os.path.join(dst_root, f))
+        shutil.copystat(root, dst_root)
+
+
+# fuse glob patterns into one compiled regex, memoized so the hot paths compile each set once
+def compilePatterns(patterns):
+    key = tuple(patterns)
+    regex = _pattern_cache.get(key)
+    if regex is None:
+        regex = re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+        _pattern_cache[key] = regex
+    return regex
+
+
+# return shutil.copytree ignore callable backed by the fused regex, None when nothing to ignore
+def ignoreFunction(patterns):
+    if not patterns:
+        return None
+    regex = compilePatterns(patterns)
+    return lambda path, names: {name for name in names if regex.match(name)}
+
+
+# return set with filenames in path directory that match patterns
 def ignoredNames(path: str, patterns):
-    names = os.listdir(path)
-    ignored_names = []
-    for pattern in patterns:
-        ignored_names.extend(fnmatch.filter(names, pattern))
-    return set(ignored_names)
+    if not patterns:
+        return set()
+    regex = compilePatterns(patterns)
+    return {name for name in os.listdir(path) if regex.match(name)}
 
 
-# transfer a file from src to dst
-def transferFile(src, dst, method=Method.Copy, force=False):
-    # check if dst object exists
-    if os.path.exists(dst):
+# transfer a file from src to dst, src_stat can be passed in to avoid re-stating
+def transferFile(src, dst, method=Method.Copy, force=False, src_stat=None):
+    # check if dst object exists with a single stat call
+    try:
+        dst_stat = os.lstat(dst)
+    except OSError:
+        dst_stat = None
+    if dst_stat is not None:
         if not force:
+            # reuse stats when both objects are plain files, re-stat through links otherwise
+            if src_stat is None or not stat.S_ISREG(src_stat.st_mode) or not stat.S_ISREG(dst_stat.st_mode):
+                equal = compareFiles(src, dst)
+            else:
+                equal = compareFiles(src, dst, stat1=src_stat, stat2=dst_stat)
             # skip file if src and dst are equal
-            if compareFiles(src, dst):
+            if equal:
                 return Response.Skip
         os.remove(dst)
-    # if not, make sure we have dst dir
+    # if not, make sure we have dst dir, once per directory for the whole run
     else:
         dst_dirname, dst_basename = os.path.split(dst)
-        if not os.path.exists(dst_dirname):
-            os.makedirs(dst_dirname)
-    # transfer file by selected method
-    if method == Method.Link:
-        os.link(src, dst)
-    elif method == Method.Symlink:
-        os.symlink(src, dst)
-    elif method == Method.Copy:
-        shutil.copy2(src, dst)
-    elif method == Method.Move:
-        shutil.move(src, dst)
-    else:
+        if dst_dirname not in _mkdir_cache:
+            os.makedirs(dst_dirname, exist_ok=True)
+            _mkdir_cache.add(dst_dirname)
+    # transfer file by selected method, one dict lookup instead of an if-elif chain
+    transfer_function = _FILE_DISPATCH.get(method)
+    if transfer_function is None:
         return Response.UnknownMethod
+    transfer_function(src, dst)
     return Response.Ok
 
 
@@ -166,36 +482,48 @@ def transferDir(src, dst, method=Method.Copy, force=False, ignorepatterns=[], on
         if deletedst:
             keep_names = ignoredNames(dst, keeppatterns)
             filenames = [f for f in os.listdir(dst) if f not in keep_names]
+            # unlink files and links in batches, directories cannot be batched
+            unlink_paths = []
             for filename in filenames:
                 filepath = os.path.join(dst, filename)
                 if os.path.isfile(filepath) or os.path.islink(filepath):
-                    os.remove(filepath)
+                    unlink_paths.append(filepath)
                 elif os.path.isdir(filepath):
                     shutil.rmtree(filepath)
+            batchUnlink(unlink_paths)
     # transfer only files from src directory
     if onlyfiles:
         ignored_names = ignoredNames(src, ignorepatterns)
         filenames = [f for f in os.listdir(src)
                      if os.path.isfile(os.path.join(src, f)) and f not in ignored_names]
-        for filename in filenames:
-            resp = transferFile(os.path.join(src, filename), os.path.join(dst, filename), method=method)
-            if resp is not Response.Ok:
-                return resp
+        # make dst dir up front so workers do not race on creating it
+        os.makedirs(dst, exist_ok=True)
+        # link methods are metadata-only and contend on inode locks, keep their pool small
+        max_workers = 4 if method in (Method.Link, Method.Symlink) else 16
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(transferFile, os.path.join(src, filename), os.path.join(dst, filename),
+                                       method, force)
+                       for filename in filenames]
+            for future in as_completed(futures):
+                resp = future.result()
+                if resp is not Response.Ok:
+                    for other in futures:
+                        other.cancel()
+                    return resp
     # transfer whole src directory
     else:
         # transfer dir by selected method
         if method == Method.Link:
             shutil.copytree(src, dst, copy_function=os.link, dirs_exist_ok=True,
-                            ignore=shutil.ignore_patterns(*ignorepatterns))
+                            ignore=ignoreFunction(ignorepatterns))
         elif method == Method.Symlink:
             shutil.copytree(src, dst, copy_function=os.symlink, dirs_exist_ok=True,
-                            ignore=shutil.ignore_patterns(*ignorepatterns))
+                            ignore=ignoreFunction(ignorepatterns))
         elif method == Method.Copy:
-            shutil.copytree(src, dst, dirs_exist_ok=True,
-                            ignore=shutil.ignore_patterns(*ignorepatterns))
+            fastCopytree(src, dst, compilePatterns(ignorepatterns) if ignorepatterns else None)
         elif method == Method.Move:
             shutil.copytree(src, dst, copy_function=shutil.move, dirs_exist_ok=True,
-                            ignore=shutil.ignore_patterns(*ignorepatterns))
+                            ignore=ignoreFunction(ignorepatterns))
             shutil.rmtree(src)
         else:
             return Response.UnknownMethod
@@ -205,75 +533,176 @@ def transferDir(src, dst, method=Method.Copy, force=False, ignorepatterns=[], on
 # make transfer for file or directory
 def makeTransfer(src, dst, method=Method.Copy, force=False, ignorepatterns=[], onlyfiles=False, deletedst=False,
                  keeppatterns=[]):
-    # check source object existence
-    if os.path.exists(src):
-        # source objects is a file or a link
-        if os.path.isfile(src) or os.path.islink(src):
-            return transferFile(src, dst, method=method, force=force)
-        # source object is a directory
-        elif os.path.isdir(src):
-            return transferDir(src, dst, method=method, force=force, ignorepatterns=ignorepatterns, onlyfiles=onlyfiles,
-                               deletedst=deletedst, keeppatterns=keeppatterns)
-        # unknown type of source object
-        else:
-            return Response.UnknownType
-    # source object do not exist
-    else:
+    # check source object existence and type with a single stat call
+    try:
+        src_stat = os.lstat(src)
+    except OSError:
         return Response.SourceNotExist
-
-
-# parse line
-def parseLine(line: str, lpars: ThrowingArgumentParser, lstat: Statistics):
+    # source object is a link, follow it only to mirror the old existence check
+    if stat.S_ISLNK(src_stat.st_mode):
+        if not os.path.exists(src):
+            return Response.SourceNotExist
+        return transferFile(src, dst, method=method, force=force)
+    # source object is a file
+    elif stat.S_ISREG(src_stat.st_mode):
+        return transferFile(src, dst, method=method, force=force, src_stat=src_stat)
+    # source object is a directory
+    elif stat.S_ISDIR(src_stat.st_mode):
+        return transferDir(src, dst, method=method, force=force, ignorepatterns=ignorepatterns, onlyfiles=onlyfiles,
+                           deletedst=deletedst, keeppatterns=keeppatterns)
+    # unknown type of source object
+    else:
+        return Response.UnknownType
+
+
+# yield stripped non-empty lines of a file through mmap, one line at a time
+def readFileLines(filename):
+    with open(filename, 'rb') as file:
+        # empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            start = 0
+            while start < size:
+                end = mapped.find(b'\n', start)
+                if end < 0:
+                    end = size
+                line = mapped[start:end].decode().strip()
+                if line:
+                    yield line
+                start = end + 1
+
+
+# parse a line into transfer arguments written for makeTransfer, report goes into buf,
+# returns None for comments, empty and incorrect lines
+def parseLineArgs(line: str, lpars: ThrowingArgumentParser, lstat: Statistics, buf):
     # check line len is correct
     if len(line) == 0:
-        return
+        return None
     # check comment
     if line[0] == '#':
-        print("  Skip line: " + line[1:] + "")
+        buf.write(f"  Skip line: {line[1:]}\n")
         lstat.skipped_lines += 1
-        return
+        return None
     try:
-        line_args = lpars.parse_args(line.split())
-        input_path = line_args.input.strip().strip('"')
-        output_path = line_args.output.strip().strip('"')
+        # argparse is slow, reuse the parsed namespace for repeated identical lines
+        tokens = tuple(line.split())
+        line_args = _arg_cache.get(tokens)
+        if line_args is None:
+            line_args = lpars.parse_args(list(tokens))
+            if len(_arg_cache) >= _ARG_CACHE_LIMIT:
+                _arg_cache.clear()
+            _arg_cache[tokens] = line_args
+        (input_path, output_path, method_name, force,
+         ignorepatterns, onlyfiles, deletedst, keeppatterns) = _getLineFields(line_args)
+        input_path = _strip_regex.match(input_path).group(1)
+        output_path = _strip_regex.match(output_path).group(1)
         if input_path == "" or output_path == "":
             raise Exception("Input or output is empty")
 
-        method = line_args.method
-        force = line_args.force
-        ignorepatterns = [ip.strip().strip('"') for ip in line_args.ignorepatterns]
-        onlyfiles = line_args.onlyfiles
-        deletedst = line_args.deletedst
-        keeppatterns = [kp.strip().strip('"') for kp in line_args.keeppatterns]
+        # resolve the method string to its enum member once per line
+        method = _METHOD_BY_NAME.get(method_name)
+        # pattern lists are usually empty or already clean, reuse them as parsed in that case
+        if ignorepatterns and any('"' in ip or ip != ip.strip() for ip in ignorepatterns):
+            ignorepatterns = [_strip_regex.match(ip).group(1) for ip in ignorepatterns]
+        if keeppatterns and any('"' in kp or kp != kp.strip() for kp in keeppatterns):
+            keeppatterns = [_strip_regex.match(kp).group(1) for kp in keeppatterns]
 
-        print("  Handle line: " + line[1:] + "")
-        print("    " + method.capitalize() + " \"" + input_path + "\" --> \"" + output_path + "\" ...")
+        buf.write(f"  Handle line: {line[1:]}\n")
+        buf.write(f"    {method_name.capitalize()} \"{input_path}\" --> \"{output_path}\" ...\n")
         lstat.correct_lines += 1
-        res = makeTransfer(input_path, output_path, method=method, force=force,
-                           ignorepatterns=ignorepatterns, onlyfiles=onlyfiles, deletedst=deletedst,
-                           keeppatterns=keeppatterns)
-        if res == Response.Ok:
-            lstat.succeeded_transfers += 1
-            print("    Ok")
-        elif res == Response.SourceNotExist:
-            print("    Fail: source object not exist")
-            lstat.failed_transfers += 1
-        elif res == Response.UnknownType:
-            print("    Fail: unknown type of source object ")
-            lstat.failed_transfers += 1
-        elif res == Response.UnknownMethod:
-            print("    Fail: unknown transfer method")
-            lstat.failed_transfers += 1
-        elif res == Response.Skip:
-            lstat.skipped_transfers += 1
-            print("    Skip")
+        return (input_path, output_path, method, force, ignorepatterns, onlyfiles, deletedst, keeppatterns)
     except Exception as e:
-        print("  Cannot handle line: " + line + ", because " + str(e))
+        buf.write(f"  Cannot handle line: {line}, because {str(e)}\n")
         lstat.incorrect_lines += 1
+        return None
+
+
+# record a transfer response in the report buffer and the statistics
+def recordResponse(res: Response, lstat: Statistics, buf):
+    if res == Response.Ok:
+        lstat.succeeded_transfers += 1
+        buf.write("    Ok\n")
+    elif res == Response.SourceNotExist:
+        buf.write("    Fail: source object not exist\n")
+        lstat.failed_transfers += 1
+    elif res == Response.UnknownType:
+        buf.write("    Fail: unknown type of source object \n")
+        lstat.failed_transfers += 1
+    elif res == Response.UnknownMethod:
+        buf.write("    Fail: unknown transfer method\n")
+        lstat.failed_transfers += 1
+    elif res == Response.Skip:
+        lstat.skipped_transfers += 1
+        buf.write("    Skip\n")
+
+
+# parse line
+def parseLine(line: str, lpars: ThrowingArgumentParser, lstat: Statistics):
+    # buffer the report and write it to stdout in one call at the end
+    buf = io.StringIO()
+    transfer_args = parseLineArgs(line, lpars, lstat, buf)
+    if transfer_args is not None:
+        src, dst, method, force, ignorepatterns, onlyfiles, deletedst, keeppatterns = transfer_args
+        try:
+            res = makeTransfer(src, dst, method=method, force=force,
+                               ignorepatterns=ignorepatterns, onlyfiles=onlyfiles, deletedst=deletedst,
+                               keeppatterns=keeppatterns)
+            recordResponse(res, lstat, buf)
+        except Exception as e:
+            buf.write(f"  Cannot handle line: {line}, because {str(e)}\n")
+            lstat.incorrect_lines += 1
+    sys.stdout.write(buf.getvalue())
+
+
+# run one group of transfers sequentially inside a worker process,
+# exceptions are returned as strings so the parent can report them
+def runTransferGroup(group):
+    results = []
+    for src, dst, method, force, ignorepatterns, onlyfiles, deletedst, keeppatterns in group:
+        try:
+            results.append(makeTransfer(src, dst, method=method, force=force,
+                                        ignorepatterns=ignorepatterns, onlyfiles=onlyfiles, deletedst=deletedst,
+                                        keeppatterns=keeppatterns))
+        except Exception as e:
+            results.append(str(e))
+    return results
+
+
+# parse all lines up front and run the transfers in a pool of worker processes,
+# grouped by top-level source directory so workers never race on the same tree
+def parseLinesParallel(lines, lpars: ThrowingArgumentParser, lstat: Statistics, jobs: int):
+    groups = {}
+    for line in lines:
+        buf = io.StringIO()
+        transfer_args = parseLineArgs(line, lpars, lstat, buf)
+        if transfer_args is None:
+            sys.stdout.write(buf.getvalue())
+        else:
+            # key on the first real path component, absolute paths would otherwise
+            # all share the empty component before the leading separator
+            key = os.path.abspath(transfer_args[0]).lstrip(os.sep).split(os.sep, 1)[0]
+            groups.setdefault(key, []).append((transfer_args, buf))
+    group_items = list(groups.values())
+    with multiprocessing.Pool(jobs) as pool:
+        group_results = pool.map(runTransferGroup, [[item[0] for item in group] for group in group_items])
+    for group, results in zip(group_items, group_results):
+        for (transfer_args, buf), res in zip(group, results):
+            if isinstance(res, Response):
+                recordResponse(res, lstat, buf)
+            else:
+                buf.write(f"  Cannot handle transfer: {res}\n")
+                lstat.incorrect_lines += 1
+            sys.stdout.write(buf.getvalue())
 
 
 if __name__ == '__main__':
     try:
+        # block-buffer stdout when piped, line reports are written in one call each
+        if not sys.stdout.isatty():
+            sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
         print("File-copy-helper script starts")
 
         parser = ThrowingArgumentParser(description='Arg parser')
@@ -287,6 +716,10 @@ if __name__ == '__main__':
                             help='pattern of files to parse lines, default: \'*.txt\'')
         parser.add_argument('-es', '--endsleep', metavar='endsleep', type=int, default='0',
                             help='sleep seconds at the end of script, default: 0')
+        parser.add_argument('-nc', '--nocache', action='store_true',
+                            help='disable caching of file content digests between comparisons')
+        parser.add_argument('-j', '--jobs', metavar='jobs', type=int, default='1',
+                            help='worker processes for transfers, default: 1')
         args = parser.parse_args()
 
         app_lines = args.lines
@@ -299,18 +732,19 @@ if __name__ == '__main__':
         app_filepattern = args.filepattern
         print("App file pattern: " + app_filepattern)
         app_endsleep = int(args.endsleep)
+        app_jobs = max(int(args.jobs), 1)
+        if args.nocache:
+            _use_hash_cache = False
 
         line_parser = ThrowingArgumentParser(description="Line parser")
         line_parser.add_argument('-i', '--input', metavar='input', type=str, default="",
                                  help="input path to file/directory")
         line_parser.add_argument('-o', '--output', metavar='output', type=str, default="",
                                  help="output path to file/directory")
-        line_parser.add_argument('-m', '--method', metavar='method', type=str, default=Method.Copy,
-                                 help="method for file transfer, available methods: \'" +
-                                      Method.Link + "\' to make hardlink, \'" +
-                                      Method.Symlink + "\' to make symbolic link, \'" +
-                                      Method.Copy + "\' to copy, \'" + Method.Move + "\' to cut, "
-                                      "default: \'" + Method.Copy + "\'")
+        line_parser.add_argument('-m', '--method', metavar='method', type=str, default="copy",
+                                 help="method for file transfer, available methods: \'link\' to make hardlink, "
+                                      "\'symlink\' to make symbolic link, \'copy\' to copy, \'move\' to cut, "
+                                      "default: \'copy\'")
         line_parser.add_argument('-f', '--force', action='store_true',
                                  help="force call transfer function if objects are the same")
         line_parser.add_argument('-ip', '--ignorepatterns', metavar='ignorepatterns', nargs="+", default=[],
@@ -322,14 +756,18 @@ if __name__ == '__main__':
         line_parser.add_argument('-kp', '--keeppatterns', metavar='keeppatterns', nargs="+", default=[],
                                  help="keep patterns for objects in destination directory if -dd is active")
 
-        stat = Statistics()
+        # name must not shadow the stat module used by the transfer functions
+        run_stat = Statistics()
         # parse lines
         if len(app_lines):
             linelist = list(filter(None, (line.strip() for line in app_lines)))
-            stat.total_lines += len(linelist)
+            run_stat.total_lines += len(linelist)
             print("Parse " + str(len(linelist)) + " line(s) ...")
-            for line in linelist:
-                parseLine(line, line_parser, stat)
+            if app_jobs > 1:
+                parseLinesParallel(linelist, line_parser, run_stat, app_jobs)
+            else:
+                for line in linelist:
+                    parseLine(line, line_parser, run_stat)
         # handle files
         else:
             linelist_filenames = []
@@ -354,19 +792,25 @@ if __name__ == '__main__':
                 print("Found " + str(len(linelist_filenames)) + " file(s) to parse")
                 # iterate over all line files
                 for linelist_filename in linelist_filenames:
-                    # open each line file
-                    with open(linelist_filename, "r") as file:
-                        linelist = list(filter(None, (line.strip() for line in file)))
-                        stat.total_lines += len(linelist)
-                        print("Handle file: \"" + linelist_filename + "\", lines to parse: " + str(len(linelist)))
-                        # iterate over every line in file
-                        for line in linelist:
-                            parseLine(line, line_parser, stat)
-
-        print("Correct/skipped/incorrect/total lines: " + str(stat.correct_lines) + "/" +
-              str(stat.skipped_lines) + "/" + str(stat.incorrect_lines) + "/" + str(stat.total_lines) + ", \n"
-              "Succeeded/skipped/incorrect/total transfers: " + str(stat.succeeded_transfers) + "/" +
-              str(stat.skipped_transfers) + "/" + str(stat.incorrect_lines) + "/" + str(stat.correct_lines))
+                    # stream each line file without materializing it in memory
+                    print("Handle file: \"" + linelist_filename + "\"")
+                    # worker processes need all lines of the file up front
+                    if app_jobs > 1:
+                        linelist = list(readFileLines(linelist_filename))
+                        file_lines = len(linelist)
+                        parseLinesParallel(linelist, line_parser, run_stat, app_jobs)
+                    else:
+                        file_lines = 0
+                        for line in readFileLines(linelist_filename):
+                            file_lines += 1
+                            parseLine(line, line_parser, run_stat)
+                    run_stat.total_lines += file_lines
+                    print("Parsed lines: " + str(file_lines))
+
+        print("Correct/skipped/incorrect/total lines: " + str(run_stat.correct_lines) + "/" +
+              str(run_stat.skipped_lines) + "/" + str(run_stat.incorrect_lines) + "/" + str(run_stat.total_lines) + ", \n"
+              "Succeeded/skipped/incorrect/total transfers: " + str(run_stat.succeeded_transfers) + "/" +
+              str(run_stat.skipped_transfers) + "/" + str(run_stat.incorrect_lines) + "/" + str(run_stat.correct_lines))
         time.sleep(app_endsleep)
     except Exception as e:
         print(str(e))